@@ -10,31 +10,28 @@ This is your first step into LangChain! This script demonstrates:
 Run this script: python src/basics/01_simple_llm.py
 """
 
+import asyncio
 import sys
-import os
-
-# Add the src directory to Python path so we can import our config
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import get_llm, print_config_status, test_llm_connection
 
-def simple_llm_call():
+async def simple_llm_call():
     """
     Demonstrate the most basic LLM usage.
-    
+
     This is the foundation of all LangChain applications - making a simple
     call to an LLM and getting a response.
     """
     print("🚀 Example 1: Simple LLM Call")
     print("-" * 40)
-    
+
     try:
         # Get an LLM instance (auto-selects based on available API keys)
         llm = get_llm("auto", temperature=0.7)
-        
+
         # Make a simple call
-        response = llm.invoke("Hello! Please introduce yourself and tell me what you can help with.")
-        
+        response = await llm.ainvoke("Hello! Please introduce yourself and tell me what you can help with.")
+
         print(f"Response: {response.content}")
         print(f"Response Type: {type(response)}")
         print(f"Has additional info: {hasattr(response, 'response_metadata')}")
@@ -43,132 +40,168 @@ def simple_llm_call():
         print(f"❌ Error: {e}")
         print("💡 Make sure you have set up your .env file with API keys")
 
-def compare_providers():
+async def compare_providers():
     """
     Compare responses from different LLM providers.
-    
+
     This shows how LangChain provides a unified interface across
-    different LLM providers.
+    different LLM providers. The providers are queried concurrently,
+    so total latency is the slowest provider rather than the sum.
     """
     print("\n🔄 Example 2: Comparing LLM Providers")
     print("-" * 40)
-    
+
     question = "What are the key benefits of using LangChain for AI development?"
-    
+
     providers = ["openai", "anthropic"]
-    
-    for provider in providers:
-        try:
+
+    async def ask(provider):
+        return await get_llm(provider, temperature=0.3).ainvoke(question)
+
+    results = await asyncio.gather(*(ask(provider) for provider in providers), return_exceptions=True)
+
+    for provider, result in zip(providers, results):
+        if isinstance(result, Exception):
+            print(f"\n❌ {provider.upper()} failed: {result}")
+        else:
             print(f"\n🤖 {provider.upper()} Response:")
-            llm = get_llm(provider, temperature=0.3)
-            response = llm.invoke(question)
-            print(response.content[:200] + "..." if len(response.content) > 200 else response.content)
-            
-        except Exception as e:
-            print(f"❌ {provider.upper()} failed: {e}")
-
-def demonstrate_parameters():
+            content = result.content
+            print(content[:200] + ("..." if len(content) > 200 else ""))
+
+async def demonstrate_parameters():
     """
     Show how different parameters affect LLM responses.
-    
+
     Temperature, max_tokens, and other parameters significantly
-    affect the LLM's behavior.
+    affect the LLM's behavior. All temperature variants are requested
+    concurrently since they don't depend on each other.
     """
     print("\n⚙️ Example 3: LLM Parameters")
     print("-" * 40)
-    
+
     prompt = "Write a creative story in exactly one sentence about a robot learning to paint."
-    
+
     # Test different temperature settings
     temperatures = [0.0, 0.5, 1.0]
-    
-    for temp in temperatures:
-        try:
-            print(f"\n🌡️ Temperature {temp}:")
-            llm = get_llm("auto", temperature=temp, max_tokens=100)
-            response = llm.invoke(prompt)
+
+    llms = [get_llm("auto", temperature=temp, max_tokens=100) for temp in temperatures]
+    responses = await asyncio.gather(*(llm.ainvoke(prompt) for llm in llms), return_exceptions=True)
+
+    for temp, response in zip(temperatures, responses):
+        print(f"\n🌡️ Temperature {temp}:")
+        if isinstance(response, Exception):
+            print(f"❌ Error with temperature {temp}: {response}")
+        else:
             print(response.content)
-            
-        except Exception as e:
-            print(f"❌ Error with temperature {temp}: {e}")
 
-def batch_processing():
+async def batch_processing():
     """
     Demonstrate batch processing of multiple queries.
-    
+
     Sometimes you need to process multiple queries efficiently.
-    LangChain provides batch processing capabilities.
+    LangChain's batch API fans requests out concurrently, so total
+    latency is roughly the slowest request instead of the sum of all.
     """
     print("\n📦 Example 4: Batch Processing")
     print("-" * 40)
-    
+
     questions = [
         "What is machine learning?",
         "Explain neural networks in simple terms.",
         "What are the benefits of prompt engineering?"
     ]
-    
+
     try:
         llm = get_llm("auto", temperature=0.2)
-        
-        print("Processing questions individually:")
-        for i, question in enumerate(questions, 1):
-            response = llm.invoke(question)
+
+        print("Processing questions concurrently:")
+        responses = await llm.abatch(questions, config={"max_concurrency": 5})
+        for i, (question, response) in enumerate(zip(questions, responses), 1):
+            content = response.content
             print(f"Q{i}: {question}")
-            print(f"A{i}: {response.content[:100]}...\n")
-            
+            print(f"A{i}: {content[:100]}...\n")
+
     except Exception as e:
         print(f"❌ Batch processing error: {e}")
 
-def streaming_response():
+async def streaming_response():
     """
     Demonstrate streaming responses for real-time applications.
-    
+
     Streaming is crucial for building responsive chat applications
-    where users see text appearing in real-time.
+    where users see text appearing in real-time. The async stream lets
+    network reads overlap with rendering, and batching stdout flushes
+    avoids paying a syscall per token.
     """
     print("\n🌊 Example 5: Streaming Responses")
     print("-" * 40)
-    
+
     try:
         llm = get_llm("auto", temperature=0.7)
-        
+
         prompt = "Tell me an interesting fact about space exploration."
-        
+
         print("Streaming response (watch text appear in real-time):")
         print("Response: ", end="", flush=True)
-        
-        # Stream the response
-        for chunk in llm.stream(prompt):
-            print(chunk.content, end="", flush=True)
-        
+
+        # Write chunk bytes straight to the underlying buffer, bypassing the
+        # text-layer formatter, and flush coarsely instead of per token
+        write = sys.stdout.buffer.write
+        flush = sys.stdout.buffer.flush
+        count = 0
+        async for chunk in llm.astream(prompt):
+            text = chunk.content
+            write(text.encode("utf-8"))
+            count += 1
+            if count % 8 == 0 or "\n" in text:
+                flush()
+        flush()
+
         print("\n✅ Streaming complete!")
-        
+
     except Exception as e:
         print(f"❌ Streaming error: {e}")
 
+async def _run_all():
+    """Run the independent examples concurrently with bounded parallelism."""
+    examples = [
+        simple_llm_call,
+        compare_providers,
+        demonstrate_parameters,
+        batch_processing,
+        streaming_response,
+    ]
+
+    # Cap in-flight examples so concurrent fan-out stays within rate limits
+    sem = asyncio.Semaphore(3)
+
+    async def guarded(coro):
+        async with sem:
+            return await coro
+
+    results = await asyncio.gather(*(guarded(fn()) for fn in examples), return_exceptions=True)
+    for fn, result in zip(examples, results):
+        if isinstance(result, Exception):
+            print(f"❌ {fn.__name__} failed: {result}")
+
 def main():
-    """Run all examples in sequence."""
+    """Run all examples."""
     print("🔬 LangChain Lab - Lesson 1: Simple LLM Usage")
     print("=" * 50)
-    
+
     # Show configuration status first
     print_config_status()
-    
+
     # Test connection
     print("🔌 Testing LLM Connection...")
     if not test_llm_connection():
         print("❌ Cannot proceed without a working LLM connection.")
         print("💡 Please check your .env file and API keys.")
         return
-    
-    # Run all examples
-    simple_llm_call()
-    compare_providers()
-    demonstrate_parameters()
-    batch_processing()
-    streaming_response()
-    
+
+    # Run all examples concurrently (output from different examples may interleave)
+    asyncio.run(_run_all())
+
     print("\n🎉 Lesson 1 Complete!")
     print("💡 Next: Run 'python src/basics/02_prompt_templates.py' to learn about prompt engineering")
 
@@ -11,17 +11,163 @@ This lesson covers the art and science of prompt engineering:
 Run this script: python src/basics/02_prompt_templates.py
 """
 
-import sys
-import os
-
-# Add the src directory to Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+from functools import lru_cache
 
 from config.settings import get_llm, print_config_status
+from langchain.embeddings import CacheBackedEmbeddings
 from langchain.prompts import PromptTemplate, ChatPromptTemplate, FewShotPromptTemplate
+from langchain.prompts.example_selector import SemanticSimilarityExampleSelector
+from langchain.storage import LocalFileStore
+from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import HumanMessagePromptTemplate, SystemMessagePromptTemplate
+from langchain_core.pydantic_v1 import BaseModel, Field
+from langchain_openai import OpenAIEmbeddings
+from utils.structural_cache import CachedPrompt
+
+class LanguageDescription(BaseModel):
+    """Structured description of a programming language."""
+
+    emoji: str = Field(description="A single emoji that fits the language")
+    description: str = Field(description="One engaging sentence about the language")
+
+# Templates are compiled once at module scope -- construction parses the
+# template string and validates input_variables, so rebuilding them on
+# every call is wasted work once these demos run in a loop.
+
+_BASIC_TEMPLATE = PromptTemplate(
+    template="""
+        You are an expert {role} with {years} years of experience.
+
+        Please explain {topic} to a {audience} in a way that is:
+        - Easy to understand
+        - Practical and actionable
+        - Engaging and interesting
+
+        Topic: {topic}
+        Audience: {audience}
+        """,
+    input_variables=["role", "years", "topic", "audience"]
+)
+
+_FEW_SHOT_EXAMPLES = [
+    {
+        "input": "Python",
+        "output": "🐍 Python: A versatile, high-level programming language known for its simplicity and readability. Great for beginners!"
+    },
+    {
+        "input": "JavaScript",
+        "output": "⚡ JavaScript: The language of the web! Runs in browsers and servers, perfect for interactive websites and web apps."
+    },
+    {
+        "input": "Rust",
+        "output": "🦀 Rust: A systems programming language focused on safety and performance. Memory-safe without garbage collection!"
+    }
+]
+
+_FEW_SHOT_EXAMPLE_TEMPLATE = PromptTemplate(
+    input_variables=["input", "output"],
+    template="Programming Language: {input}\nDescription: {output}"
+)
 
-def basic_prompt_template():
+@lru_cache(maxsize=1)
+def _few_shot_template():
+    """
+    Build the few-shot template with a semantic example selector.
+
+    Instead of injecting every example, only the k nearest examples to
+    the query are included, so prompt length stays constant as the
+    example pool grows. Embeddings are cached on disk so repeat runs
+    never re-embed the examples. Built lazily (and once) because the
+    selector embeds the examples via the API.
+    """
+    store = LocalFileStore("./.emb_cache/")
+    cached_embeddings = CacheBackedEmbeddings.from_bytes_store(
+        OpenAIEmbeddings(), store, namespace="few_shot"
+    )
+
+    example_selector = SemanticSimilarityExampleSelector.from_examples(
+        _FEW_SHOT_EXAMPLES, cached_embeddings, FAISS, k=2
+    )
+
+    return FewShotPromptTemplate(
+        example_selector=example_selector,
+        example_prompt=_FEW_SHOT_EXAMPLE_TEMPLATE,
+        prefix="Generate engaging descriptions for programming languages in this format:",
+        suffix="Programming Language: {input}\nDescription:",
+        input_variables=["input"]
+    )
+
+# One pre-built template per difficulty level; instructions stay as a
+# static, cacheable prefix with {topic} trailing (see conditional_prompting)
+_DIFFICULTY_TEMPLATES = {
+    "beginner": PromptTemplate(
+        template="""
+                Explain the following topic to someone who is completely new to the subject.
+                Use simple language, avoid jargon, and include analogies.
+                Keep it short and encouraging.
+
+                Topic: {topic}
+                """,
+        input_variables=["topic"]
+    ),
+    "intermediate": PromptTemplate(
+        template="""
+                Explain the following topic for someone with basic knowledge.
+                Include technical details but keep explanations clear.
+                Provide practical examples and use cases.
+
+                Topic: {topic}
+                """,
+        input_variables=["topic"]
+    ),
+    "advanced": PromptTemplate(
+        template="""
+                Provide an in-depth explanation of the following topic for experts.
+                Include technical specifications, edge cases, and best practices.
+                Assume deep knowledge of related concepts.
+
+                Topic: {topic}
+                """,
+        input_variables=["topic"]
+    ),
+}
+
+@lru_cache(maxsize=64)
+def build_writing_prompt(writing_type, audience, tone, length):
+    """Build a writing prompt based on parameters.
+
+    Cached so repeated scenarios reuse the compiled template instead of
+    re-parsing it on every call.
+    """
+
+    # Static instructions first; the variable slots go in a trailing
+    # block so the shared prefix stays cacheable across scenarios
+    base_template = "You are a skilled writer. Produce the requested piece for the given audience and tone."
+
+    # Add length specification
+    length_specs = {
+        "short": "Keep it under 100 words.",
+        "medium": "Aim for 200-300 words.",
+        "long": "Write 500+ words with detailed explanations."
+    }
+
+    # Add tone guidance
+    tone_guidance = {
+        "professional": "Use formal language and industry terminology.",
+        "casual": "Use conversational language and relatable examples.",
+        "humorous": "Include appropriate humor and wit.",
+        "educational": "Focus on teaching and clear explanations."
+    }
+
+    full_template = f"{base_template} {length_specs.get(length, '')} {tone_guidance.get(tone, '')}"
+
+    return PromptTemplate(
+        template=full_template + "\n\nWriting type: {writing_type}\nAudience: {audience}\nTone: {tone}\nTopic: {topic}",
+        input_variables=["writing_type", "audience", "tone", "topic"]
+    )
+
+async def basic_prompt_template():
     """
     Demonstrate basic prompt templates with variable substitution.
     
@@ -33,27 +179,9 @@ def basic_prompt_template():
     
     try:
         llm = get_llm("auto", temperature=0.3)
-        
-        # Create a simple template
-        template = """
-        You are an expert {role} with {years} years of experience.
-        
-        Please explain {topic} to a {audience} in a way that is:
-        - Easy to understand
-        - Practical and actionable
-        - Engaging and interesting
-        
-        Topic: {topic}
-        Audience: {audience}
-        """
-        
-        prompt = PromptTemplate(
-            template=template,
-            input_variables=["role", "years", "topic", "audience"]
-        )
-        
-        # Format the prompt with specific values
-        formatted_prompt = prompt.format(
+
+        # Format the pre-compiled template with specific values
+        formatted_prompt = _BASIC_TEMPLATE.format(
             role="Python developer",
             years="10",
             topic="object-oriented programming",
@@ -62,15 +190,22 @@ def basic_prompt_template():
         
         print("📋 Formatted Prompt:")
         print(formatted_prompt)
-        
-        # Send to LLM
-        response = llm.invoke(formatted_prompt)
+
+        # Send to LLM via the structural cache; an identical
+        # (template, variables) combination is answered from disk
+        cached_prompt = CachedPrompt(_BASIC_TEMPLATE, llm)
+        response = await cached_prompt.ainvoke(
+            role="Python developer",
+            years="10",
+            topic="object-oriented programming",
+            audience="beginners"
+        )
         print(f"\n🤖 Response:\n{response.content[:300]}...")
         
     except Exception as e:
         print(f"❌ Error: {e}")
 
-def chat_prompt_template():
+async def chat_prompt_template():
     """
     Demonstrate chat-style prompt templates.
     
@@ -83,12 +218,14 @@ def chat_prompt_template():
     try:
         llm = get_llm("auto", temperature=0.5)
         
-        # Create a chat prompt template
+        # Create a chat prompt template. The static framing comes first and
+        # all variables land in the trailing human message, so provider-side
+        # prompt caching can reuse the shared prefix across subjects.
         chat_prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are a helpful assistant that explains {subject} concepts clearly and concisely."),
-            ("human", "Hello! I'm new to {subject}."),
-            ("ai", "Hello! I'd be happy to help you learn {subject}. What specific topic would you like to start with?"),
-            ("human", "{user_question}")
+            ("system", "You are a helpful assistant that explains technical concepts clearly and concisely."),
+            ("human", "Hello! I'm new to this subject."),
+            ("ai", "Hello! I'd be happy to help you learn. What specific topic would you like to start with?"),
+            ("human", "Subject: {subject}\nQuestion: {user_question}")
         ])
         
         # Format the chat prompt
@@ -102,13 +239,13 @@ def chat_prompt_template():
             print(f"{message.type}: {message.content}")
         
         # Send to LLM
-        response = llm.invoke(formatted_chat)
+        response = await llm.ainvoke(formatted_chat)
         print(f"\n🤖 Response:\n{response.content}")
         
     except Exception as e:
         print(f"❌ Error: {e}")
 
-def few_shot_prompting():
+async def few_shot_prompting():
     """
     Demonstrate few-shot prompting techniques.
     
@@ -120,52 +257,31 @@ def few_shot_prompting():
     
     try:
         llm = get_llm("auto", temperature=0.2)
-        
-        # Define examples for few-shot learning
-        examples = [
-            {
-                "input": "Python",
-                "output": "🐍 Python: A versatile, high-level programming language known for its simplicity and readability. Great for beginners!"
-            },
-            {
-                "input": "JavaScript", 
-                "output": "⚡ JavaScript: The language of the web! Runs in browsers and servers, perfect for interactive websites and web apps."
-            },
-            {
-                "input": "Rust",
-                "output": "🦀 Rust: A systems programming language focused on safety and performance. Memory-safe without garbage collection!"
-            }
-        ]
-        
-        # Create example template
-        example_template = PromptTemplate(
-            input_variables=["input", "output"],
-            template="Programming Language: {input}\nDescription: {output}"
-        )
-        
-        # Create few-shot prompt
-        few_shot_prompt = FewShotPromptTemplate(
-            examples=examples,
-            example_prompt=example_template,
-            prefix="Generate engaging descriptions for programming languages in this format:",
-            suffix="Programming Language: {input}\nDescription:",
-            input_variables=["input"]
-        )
-        
-        # Test with new language
+
+        # Test with new language; only the 2 most similar examples are
+        # included (see _few_shot_template)
         test_language = "Go"
-        formatted_prompt = few_shot_prompt.format(input=test_language)
+        formatted_prompt = _few_shot_template().format(input=test_language)
         
         print("📋 Few-Shot Prompt:")
         print(formatted_prompt)
         
-        response = llm.invoke(formatted_prompt)
+        response = await llm.ainvoke(formatted_prompt)
         print(f"\n🤖 Response:\n{response.content}")
-        
+
+        # Structured-output alternative: the schema enforces the shape, so
+        # no example tokens are spent and no string parsing is needed.
+        # get_llm("auto") may return a fallback chain, which doesn't expose
+        # with_structured_output, so unwrap to the primary model first.
+        base_llm = getattr(llm, "runnable", llm)
+        structured_llm = base_llm.with_structured_output(LanguageDescription)
+        result = await structured_llm.ainvoke(f"Describe the {test_language} programming language.")
+        print(f"\n🧩 Structured Output (schema instead of examples):\n{result.emoji} {result.description}")
+
     except Exception as e:
         print(f"❌ Error: {e}")
 
-def conditional_prompting():
+async def conditional_prompting():
     """
     Demonstrate conditional prompting based on context.
     
@@ -177,46 +293,23 @@ def conditional_prompting():
     
     try:
         llm = get_llm("auto", temperature=0.4)
-        
-        def create_prompt_for_difficulty(topic, difficulty_level):
-            """Create different prompts based on difficulty level."""
-            
-            if difficulty_level == "beginner":
-                template = """
-                Explain {topic} to someone who is completely new to the subject.
-                Use simple language, avoid jargon, and include analogies.
-                Keep it short and encouraging.
-                """
-            elif difficulty_level == "intermediate":
-                template = """
-                Explain {topic} for someone with basic knowledge.
-                Include technical details but keep explanations clear.
-                Provide practical examples and use cases.
-                """
-            else:  # advanced
-                template = """
-                Provide an in-depth explanation of {topic} for experts.
-                Include technical specifications, edge cases, and best practices.
-                Assume deep knowledge of related concepts.
-                """
-            
-            return PromptTemplate(template=template, input_variables=["topic"])
-        
+
         topic = "neural networks"
         difficulties = ["beginner", "intermediate", "advanced"]
-        
-        for difficulty in difficulties:
+
+        # Format every prompt up front, then issue one batched call so the
+        # three requests overlap instead of alternating with Python work
+        prompts = [_DIFFICULTY_TEMPLATES[difficulty].format(topic=topic) for difficulty in difficulties]
+        responses = await llm.abatch(prompts)
+
+        for difficulty, response in zip(difficulties, responses):
             print(f"\n📚 {difficulty.upper()} Level:")
-            prompt = create_prompt_for_difficulty(topic, difficulty)
-            formatted_prompt = prompt.format(topic=topic)
-            
-            response = llm.invoke(formatted_prompt)
             print(response.content[:200] + "...")
             
     except Exception as e:
         print(f"❌ Error: {e}")
 
-def dynamic_prompt_building():
+async def dynamic_prompt_building():
     """
     Demonstrate building prompts dynamically based on user input.
     
@@ -228,34 +321,7 @@ def dynamic_prompt_building():
     
     try:
         llm = get_llm("auto", temperature=0.6)
-        
-        def build_writing_prompt(writing_type, audience, tone, length):
-            """Build a writing prompt based on parameters."""
-            
-            base_template = "Write a {writing_type} for {audience} with a {tone} tone."
-            
-            # Add length specification
-            length_specs = {
-                "short": "Keep it under 100 words.",
-                "medium": "Aim for 200-300 words.", 
-                "long": "Write 500+ words with detailed explanations."
-            }
-            
-            # Add tone guidance
-            tone_guidance = {
-                "professional": "Use formal language and industry terminology.",
-                "casual": "Use conversational language and relatable examples.",
-                "humorous": "Include appropriate humor and wit.",
-                "educational": "Focus on teaching and clear explanations."
-            }
-            
-            full_template = f"{base_template} {length_specs.get(length, '')} {tone_guidance.get(tone, '')}"
-            
-            return PromptTemplate(
-                template=full_template + "\n\nTopic: {topic}",
-                input_variables=["writing_type", "audience", "tone", "topic"]
-            )
-        
+
         # Test different combinations
         scenarios = [
             {
@@ -274,39 +340,67 @@ def dynamic_prompt_building():
             }
         ]
         
-        for i, scenario in enumerate(scenarios, 1):
-            print(f"\n📝 Scenario {i}:")
+        # Build every prompt first, then overlap the LLM calls; each prompt
+        # goes through the structural cache so repeated scenarios are
+        # answered from disk without a network round-trip
+        prompts = []
+        cached_prompts = []
+        for scenario in scenarios:
             prompt = build_writing_prompt(
                 scenario["writing_type"],
-                scenario["audience"], 
+                scenario["audience"],
                 scenario["tone"],
                 scenario["length"]
             )
-            
-            formatted_prompt = prompt.format(**scenario)
+            prompts.append(prompt.format(**scenario))
+            cached_prompts.append(CachedPrompt(prompt, llm))
+
+        responses = await asyncio.gather(
+            *(cp.ainvoke(**scenario) for cp, scenario in zip(cached_prompts, scenarios))
+        )
+
+        for i, (formatted_prompt, response) in enumerate(zip(prompts, responses), 1):
+            print(f"\n📝 Scenario {i}:")
             print(f"Prompt: {formatted_prompt}")
-            
-            response = llm.invoke(formatted_prompt)
-            print(f"Response: {response.content[:150]}...")
+            content = response.content
+            print(f"Response: {content[:150]}...")
             
     except Exception as e:
         print(f"❌ Error: {e}")
 
+async def _run_all():
+    """Run the independent examples concurrently with bounded parallelism."""
+    examples = [
+        basic_prompt_template,
+        chat_prompt_template,
+        few_shot_prompting,
+        conditional_prompting,
+        dynamic_prompt_building,
+    ]
+
+    # Cap in-flight examples so concurrent fan-out stays within rate limits
+    sem = asyncio.Semaphore(3)
+
+    async def guarded(coro):
+        async with sem:
+            return await coro
+
+    results = await asyncio.gather(*(guarded(fn()) for fn in examples), return_exceptions=True)
+    for fn, result in zip(examples, results):
+        if isinstance(result, Exception):
+            print(f"❌ {fn.__name__} failed: {result}")
+
 def main():
     """Run all prompt template examples."""
     print("🔬 LangChain Lab - Lesson 2: Prompt Templates")
     print("=" * 50)
-    
+
     # Show configuration status
     print_config_status()
-    
-    # Run all examples
-    basic_prompt_template()
-    chat_prompt_template()
-    few_shot_prompting()
-    conditional_prompting()
-    dynamic_prompt_building()
-    
+
+    # Run all examples concurrently (output from different examples may interleave)
+    asyncio.run(_run_all())
+
     print("\n🎉 Lesson 2 Complete!")
     print("💡 Key Takeaways:")
     print("   • Prompt templates make prompts reusable and maintainable")
@@ -5,14 +5,55 @@ This module handles API keys, model configuration, and provides
 helper functions to get LLM instances.
 """
 
+import atexit
 import os
 import logging
-from typing import Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+import httpx
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Accepted truthy spellings for boolean env vars (exact match, no
+# per-read .lower() allocation)
+_TRUE_SET = frozenset({"1", "true", "True", "TRUE", "yes", "on"})
+
+def _envbool(name: str) -> bool:
+    """Parse an environment variable as a boolean flag."""
+    return os.getenv(name, "").strip() in _TRUE_SET
+
+# Bind provider SDKs once at import time; guard so a missing optional
+# provider package only fails if that provider is actually requested
+try:
+    from langchain_openai import ChatOpenAI
+except ImportError:
+    ChatOpenAI = None
+
+try:
+    from langchain_anthropic import ChatAnthropic
+except ImportError:
+    ChatAnthropic = None
+
+# Shared HTTP clients so back-to-back LLM calls reuse keep-alive
+# connections instead of redoing the TCP+TLS handshake per instance;
+# HTTP/2 lets concurrent batch/gather calls multiplex one socket
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_SYNC_HTTP = httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=60.0)
+_ASYNC_HTTP = httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=60.0)
+atexit.register(_SYNC_HTTP.close)
+
+# Transient provider errors that should reroute to the fallback provider
+# instead of surfacing to the caller
+try:
+    from openai import APIConnectionError, RateLimitError
+    _FALLBACK_EXCEPTIONS = (APIConnectionError, RateLimitError)
+except ImportError:
+    _FALLBACK_EXCEPTIONS = (Exception,)
+
 class Settings:
     """Configuration settings for the application."""
     
@@ -22,7 +63,7 @@ class Settings:
     LANGCHAIN_API_KEY: Optional[str] = os.getenv("LANGCHAIN_API_KEY")
     
     # LangSmith Configuration
-    LANGCHAIN_TRACING_V2: bool = os.getenv("LANGCHAIN_TRACING_V2", "false").lower() == "true"
+    LANGCHAIN_TRACING_V2: bool = _envbool("LANGCHAIN_TRACING_V2")
     LANGCHAIN_PROJECT: str = os.getenv("LANGCHAIN_PROJECT", "langchain-lab")
     
     # Model Defaults
@@ -30,30 +71,37 @@ class Settings:
     DEFAULT_ANTHROPIC_MODEL: str = os.getenv("DEFAULT_ANTHROPIC_MODEL", "claude-3-sonnet-20240229")
     
     # Application Settings
-    DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
+    DEBUG: bool = _envbool("DEBUG")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    CACHE_ENABLED: bool = _envbool("CACHE_ENABLED")
+    CACHE_PATH: str = os.getenv("CACHE_PATH", ".langchain_cache.db")
     
-    @classmethod
-    def validate_api_keys(cls) -> dict:
+    # staticmethod rather than classmethod so lru_cache isn't keyed on cls;
+    # env vars are read once at import, so the result is stable per process
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def validate_api_keys() -> Mapping:
         """
         Validate that required API keys are present.
-        
+
+        The result is memoized (see reload_settings to recompute it).
+
         Returns:
-            dict: Status of each API key (present/missing)
+            Mapping: Read-only status of each API key (present/missing)
         """
         status = {
-            "openai": bool(cls.OPENAI_API_KEY),
-            "anthropic": bool(cls.ANTHROPIC_API_KEY),
-            "langsmith": bool(cls.LANGCHAIN_API_KEY)
+            "openai": bool(Settings.OPENAI_API_KEY),
+            "anthropic": bool(Settings.ANTHROPIC_API_KEY),
+            "langsmith": bool(Settings.LANGCHAIN_API_KEY)
         }
-        
-        if not cls.OPENAI_API_KEY and not cls.ANTHROPIC_API_KEY:
+
+        if not Settings.OPENAI_API_KEY and not Settings.ANTHROPIC_API_KEY:
             raise ValueError(
                 "At least one of OPENAI_API_KEY or ANTHROPIC_API_KEY must be set. "
                 "Please check your .env file."
             )
-        
-        return status
+
+        return MappingProxyType(status)
     
     @classmethod
     def setup_logging(cls):
@@ -63,61 +111,103 @@ class Settings:
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
 
+@lru_cache(maxsize=None)
+def _build_llm(provider: str, model: str, kwargs_items: tuple):
+    """
+    Construct (and cache) an LLM instance for a resolved provider/model.
+
+    Keyed on the full (provider, model, kwargs) tuple so each distinct
+    configuration is built exactly once and its HTTP connection pool is
+    reused across all the example functions.
+    """
+    kwargs = dict(kwargs_items)
+
+    if provider == "openai":
+        if ChatOpenAI is None:
+            raise ImportError("langchain-openai is not installed. Run: pip install langchain-openai")
+
+        return ChatOpenAI(
+            api_key=Settings.OPENAI_API_KEY,
+            model=model,
+            http_client=_SYNC_HTTP,
+            http_async_client=_ASYNC_HTTP,
+            **kwargs
+        )
+
+    if ChatAnthropic is None:
+        raise ImportError("langchain-anthropic is not installed. Run: pip install langchain-anthropic")
+
+    return ChatAnthropic(
+        api_key=Settings.ANTHROPIC_API_KEY,
+        model=model,
+        **kwargs
+    )
+
 def get_llm(provider: str = "auto", model: Optional[str] = None, **kwargs):
     """
     Get an LLM instance based on provider.
-    
+
+    Instances are cached per (provider, model, kwargs) configuration, so
+    repeated calls with the same parameters share one client instead of
+    re-instantiating (and re-establishing connections) every time.
+
     Args:
         provider: LLM provider ("openai", "anthropic", or "auto")
         model: Specific model name (optional)
         **kwargs: Additional arguments passed to the LLM constructor
-        
+
     Returns:
         LLM instance
-        
+
     Raises:
         ValueError: If provider is not supported or API key is missing
     """
     Settings.validate_api_keys()
-    
+
     if provider == "auto":
         # Auto-select based on available API keys
+        if Settings.OPENAI_API_KEY and Settings.ANTHROPIC_API_KEY:
+            # Both providers configured: route OpenAI failures straight to
+            # Anthropic so a rate limit or outage costs one timeout, not an
+            # exception surfaced to the caller
+            kwargs_items = tuple(sorted(kwargs.items()))
+            primary = _build_llm("openai", model or Settings.DEFAULT_OPENAI_MODEL, kwargs_items)
+            fallback = _build_llm("anthropic", Settings.DEFAULT_ANTHROPIC_MODEL, kwargs_items)
+            return primary.with_fallbacks([fallback], exceptions_to_handle=_FALLBACK_EXCEPTIONS)
         if Settings.OPENAI_API_KEY:
             provider = "openai"
         elif Settings.ANTHROPIC_API_KEY:
             provider = "anthropic"
         else:
             raise ValueError("No API keys found. Please set OPENAI_API_KEY or ANTHROPIC_API_KEY")
-    
-    if provider.lower() == "openai":
+
+    provider = provider.lower()
+
+    if provider == "openai":
         if not Settings.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
-        
-        from langchain_openai import ChatOpenAI
-        
         model = model or Settings.DEFAULT_OPENAI_MODEL
-        return ChatOpenAI(
-            api_key=Settings.OPENAI_API_KEY,
-            model=model,
-            **kwargs
-        )
-    
-    elif provider.lower() == "anthropic":
+
+    elif provider == "anthropic":
         if not Settings.ANTHROPIC_API_KEY:
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
-        
-        from langchain_anthropic import ChatAnthropic
-        
         model = model or Settings.DEFAULT_ANTHROPIC_MODEL
-        return ChatAnthropic(
-            api_key=Settings.ANTHROPIC_API_KEY,
-            model=model,
-            **kwargs
-        )
-    
+
     else:
         raise ValueError(f"Unsupported provider: {provider}. Use 'openai' or 'anthropic'")
 
+    return _build_llm(provider, model, tuple(sorted(kwargs.items())))
+
+def reload_settings():
+    """
+    Clear memoized validation and client caches.
+
+    Call this if API keys or other environment variables change at
+    runtime so subsequent get_llm calls pick up the new state.
+    """
+    Settings.validate_api_keys.cache_clear()
+    _build_llm.cache_clear()
+
 def print_config_status():
     """Print current configuration status."""
     print("🔧 Configuration Status")
@@ -150,14 +240,38 @@ def test_llm_connection(provider: str = "auto"):
         bool: True if connection successful, False otherwise
     """
     try:
-        llm = get_llm(provider)
-        response = llm.invoke("Hello! Please respond with just 'OK' to test the connection.")
+        # Cap output at a few tokens and stop at the first streamed chunk --
+        # a health check only needs proof that tokens are flowing
+        llm = get_llm(provider, max_tokens=4)
+        content = ""
+        for chunk in llm.stream("Reply OK"):
+            if chunk.content:
+                content = chunk.content
+                break
         print(f"✅ {provider.upper()} connection successful!")
-        print(f"Response: {response.content}")
+        print(f"Response: {content}")
         return True
     except Exception as e:
         print(f"❌ {provider.upper()} connection failed: {str(e)}")
         return False
 
+def setup_llm_cache():
+    """
+    Install a process-wide SQLite response cache for all LLM calls.
+
+    The lesson scripts re-run identical prompts on every invocation, so
+    caching lets repeat runs return instantly (and for free) instead of
+    paying a network round-trip per call. Enabled via CACHE_ENABLED=true.
+    """
+    from langchain.globals import set_llm_cache
+    from langchain_community.cache import SQLiteCache
+
+    set_llm_cache(SQLiteCache(database_path=Settings.CACHE_PATH))
+
 # Initialize logging when module is imported
 Settings.setup_logging()
+
+# Cache LLM responses locally when enabled (no call-site changes needed --
+# ChatOpenAI/ChatAnthropic consult the global cache on every invoke)
+if Settings.CACHE_ENABLED:
+    setup_llm_cache()
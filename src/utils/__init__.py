@@ -0,0 +1 @@
+"""Utility helpers for LangChain Lab."""
@@ -0,0 +1,81 @@
+"""
+Structural response cache for templated prompts.
+
+The lesson prompts are highly structural: the same template scaffold is
+reused with only a handful of variable slots swapped. An exact-match
+cache misses whenever any variable changes, but keying on the template
+plus its variable slots lets repeat runs of the same (template, values)
+pair skip the LLM call entirely.
+"""
+
+from hashlib import blake2b
+from typing import Optional
+
+from diskcache import Cache
+
+# Default on-disk location, shared by every CachedPrompt unless a
+# dedicated StructuralCache is passed in
+DEFAULT_CACHE_DIR = ".structural_cache"
+
+class StructuralCache:
+    """Disk-backed response cache keyed on (template hash, variable slots)."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self._cache = Cache(directory)
+
+    @staticmethod
+    def make_key(template: str, variables: dict) -> tuple:
+        """Build a cache key from a template string and its variables."""
+        template_hash = blake2b(template.encode("utf-8"), digest_size=16).hexdigest()
+        return (template_hash, tuple(sorted(variables.items())))
+
+    def get(self, template: str, variables: dict):
+        """Return the cached response for this slot combination, or None."""
+        return self._cache.get(self.make_key(template, variables))
+
+    def set(self, template: str, variables: dict, response) -> None:
+        """Store a response under this template/variable combination."""
+        self._cache[self.make_key(template, variables)] = response
+
+class CachedPrompt:
+    """
+    Bind a PromptTemplate to an LLM with structural response caching.
+
+    On a cache hit the stored response is returned without formatting the
+    prompt or touching the network; on a miss the prompt is formatted,
+    sent to the LLM, and the response is stored for next time.
+    """
+
+    def __init__(self, template, llm, cache: Optional[StructuralCache] = None):
+        self.template = template
+        self.llm = llm
+        self.cache = cache if cache is not None else _default_cache()
+
+    def invoke(self, **variables):
+        """Format and send the prompt, consulting the cache first."""
+        cached = self.cache.get(self.template.template, variables)
+        if cached is not None:
+            return cached
+
+        response = self.llm.invoke(self.template.format(**variables))
+        self.cache.set(self.template.template, variables, response)
+        return response
+
+    async def ainvoke(self, **variables):
+        """Async variant of invoke with the same cache semantics."""
+        cached = self.cache.get(self.template.template, variables)
+        if cached is not None:
+            return cached
+
+        response = await self.llm.ainvoke(self.template.format(**variables))
+        self.cache.set(self.template.template, variables, response)
+        return response
+
+_DEFAULT_CACHE: Optional[StructuralCache] = None
+
+def _default_cache() -> StructuralCache:
+    """Create (once) and return the shared on-disk cache."""
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = StructuralCache()
+    return _DEFAULT_CACHE